@@ -21,14 +21,17 @@ using the Discogs API.
 Please take into account that requests to the Discogs API are throttled
 by the server to one per second per IP address. Because images are much
 more resource-intensive to serve, image requests are limited to 1000 
-per day per IP address. [1]
+per day per IP address. [1] This module throttles its own requests 
+to stay within these limits.
 
 To minimize the chance we will send requests beyond this limit, this 
 module saves every downloaded image in the directory specified in 
 artwork.directory which defaults to ~/.covers. If artwork.directory is 
 set to None, the images are saved in the current working directory.
+Responses of the Discogs API are cached for a week in the .discogs-cache 
+subdirectory of that directory.
 
-There are three functions to retrieve the path to a downloaded image:
+There are four functions to retrieve the path to a downloaded image:
 
 1.  get_random(artist, album, year=None)
     Find all releases matching the parameters, randomly select one and 
@@ -38,11 +41,16 @@ There are three functions to retrieve the path to a downloaded image:
     Find all releases matching the parameters, find the images in all 
     of them and download the largest image available.
     
-3.  get_cache(artist, album, year=None, alt=get_random)
+3.  get_cache(artist, album, year=None, alt=get_random, validate=False)
     Search for artwork in artwork.directory and download it using the 
-    function specified by alt if it could not be found.
+    function specified by alt if it could not be found. If validate is 
+    true, check with the server that cached artwork is up to date.
 
-All functions above can raise one of the following exceptions that 
+4.  get_many(albums, max_workers=8, alt=get_random)
+    Call get_cache for a list of (artist, album, year) tuples using a 
+    pool of threads and return a dict with the paths found.
+
+The first three functions can raise one of the following exceptions that
 inherit from the base exception ArtworkError:
 
 -   DiskError
@@ -63,14 +71,19 @@ inherit from the base exception ArtworkError:
 import logging
 logger = logging.getLogger('artwork')
 
+import atexit
+import base64
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import http.client
+import hashlib
 import json
 import os
 import random
+import threading
 import time
-import urllib.request
-import urllib.error
 import urllib.parse
+import urllib.request
 
 class ArtworkError(Exception):
     """Base class for artwork errors."""
@@ -101,11 +114,21 @@ directory='~/.covers'
 _version = 0.1
 _url = 'https://github.com/vetl/discogs-artwork'
 
+_resolved_directory = (None, None)
+_created_directory = None
+
 _candidate_exts = ('jpeg', 'jpg', 'png')
-_Image = namedtuple('_Image', ('url', 'height', 'width'))
+_meta_ext = 'meta'
+_filename_table = str.maketrans(dict.fromkeys('/\\:*?"<>|\x00', '-'))
+_api_cache_dirname = '.discogs-cache'
+_api_cache_ttl = 7 * 24 * 60 * 60
+_fetch_workers = 4
+_chunk_size = 1 << 16
+_Image = namedtuple('_Image', ('url', 'height', 'width', 'area'))
 
 _discogs_api_url = 'http://api.discogs.com/'
 _discogs_api_search = 'database/search'
+_discogs_api_search_prefix = _discogs_api_url + _discogs_api_search + '?'
 _discogs_api_headers = {
     'User-Agent': 'artwork.py/{ver} +{url}'.format(ver=_version, url=_url),
 }
@@ -123,8 +146,9 @@ def get_largest(artist, album, year=None):
     images, take all those to compare with the images of other 
     releases.
     
-    This is a very slow and expensive way to retrieve artwork, but will
-    generally return a high quality image.
+    The releases are searched concurrently using at most _fetch_workers
+    threads. This is still a slow and expensive way to retrieve artwork,
+    but will generally return a high quality image.
     
     Raises ReleaseNotFoundError if no Discogs releases could be found 
     for the given parameters. Raises ImageNotFoundError if no image 
@@ -143,16 +167,19 @@ def get_largest(artist, album, year=None):
     time_begin = time.time()
     releases = _fetch_discogs_releases(artist, album, year=year)
     images = list()
-    for release in releases:
-        try:
-            images.append(_fetch_discogs_image_resources(release))
-        except ImageNotFoundError:
-            pass
-    largest_image, largest_size = None, 0
-    for image_resources in images:
-        for image in image_resources:
-            if image.width * image.height > largest_size:
-                largest_image = image
+    with ThreadPoolExecutor(max_workers=_fetch_workers) as executor:
+        futures = [executor.submit(_fetch_discogs_image_resources, release)
+                   for release in releases]
+        for future in futures:
+            try:
+                images.extend(future.result())
+            except ImageNotFoundError:
+                pass
+            except ArtworkError:
+                ### Don't spend API requests on a search that failed.
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    largest_image = max(images, key=lambda image: image.area, default=None)
     if not largest_image:
         message = ("no image found for '{album}' by '{artist}'"
                    "".format(artist=artist, album=album))
@@ -206,7 +233,7 @@ def get_random(artist, album, year=None):
     return target
 
 
-def get_cache(artist, album, year=None, alt=get_random):
+def get_cache(artist, album, year=None, alt=get_random, validate=False):
     """Return the path to an image on disk.
     
     Return the path to an image in artwork.directory if one exists. If
@@ -214,6 +241,10 @@ def get_cache(artist, album, year=None, alt=get_random):
     same parameters to download an image from Discogs and return its 
     path.
     
+    If validate is true, ask the image host whether a cached image has 
+    changed since it was downloaded (a conditional GET which costs no 
+    image transfer if it hasn't) and download it again if it has.
+    
     Raises ReleaseNotFoundError if no Discogs releases could be found 
     for the given parameters. Raises ImageNotFoundError if no image 
     could be found in the used release. Raises ResourceError if an 
@@ -228,15 +259,52 @@ def get_cache(artist, album, year=None, alt=get_random):
     Keyword arguments:
     year -- the release year of the album (default None)
     alt -- the alternative function (default artwork.get_random)
+    validate -- revalidate a cached image with the server (default 
+        False)
     """
-    return (_file_in_cache(artist, album, year=year) or
-            alt(artist, album, year=year))
+    path = _file_in_cache(artist, album, year=year)
+    if path and validate:
+        path = _file_in_cache_validated(path)
+    return path or alt(artist, album, year=year)
+
+
+def get_many(albums, max_workers=8, alt=get_random):
+    """Return a dict mapping each (artist, album, year) tuple in albums 
+    to the path of its image on disk, or None if it could not be found.
+    
+    Call get_cache for every album using a pool of at most max_workers 
+    threads. Duplicate albums are only looked up once. Errors raised 
+    for a single album are logged by the function that raised them and
+    result in None for that album.
+    
+    Arguments:
+    albums -- an iterable of (artist, album, year) tuples, year may be 
+        None
+    
+    Keyword arguments:
+    max_workers -- the maximum number of threads (default 8)
+    alt -- the alternative function (default artwork.get_random)
+    """
+    results = dict.fromkeys(albums)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(get_cache, artist, album, year=year, 
+                                   alt=alt): (artist, album, year)
+                   for artist, album, year in results}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except ArtworkError:
+                pass
+    return results
 
 
 def _create_filename(artist, album, year=None):
     """Return a string that can be used as filename (without extension)
     for an artwork image.
     
+    Characters that are not allowed in filenames on common file 
+    systems are replaced by '-'.
+    
     Arguments:
     artist -- the artist
     album -- the album
@@ -244,8 +312,8 @@ def _create_filename(artist, album, year=None):
     Keyword arguments:
     year -- the release year of the album (default None)
     """
-    artist = artist.replace('/', '-')
-    album = album.replace('/', '-')
+    artist = artist.translate(_filename_table)
+    album = album.translate(_filename_table)
     if year:
         return '{} - {} - {}'.format(artist, year, album)
     else:
@@ -267,14 +335,46 @@ def _create_target(source, artist, album, year=None):
     Keyword arguments:
     year -- the release year of the album (default None)
     """
-    global directory
     target = '{}.{}'.format(_create_filename(artist, album, year=year), 
                             source.split('.')[-1])
-    if directory:
-        target = os.path.join(directory, target)
-    else:
-        target = os.path.join(target)
-    return target
+    dirname = _expanded_directory()
+    return os.path.join(dirname, target) if dirname else target
+
+
+def _expanded_directory():
+    """Return artwork.directory with ~ expanded, or None if it is not 
+    set. The result is cached until artwork.directory changes.
+    """
+    global _resolved_directory
+    key, dirname = _resolved_directory
+    if key != directory:
+        dirname = os.path.expanduser(directory) if directory else None
+        _resolved_directory = (directory, dirname)
+    return dirname
+
+
+def _ensured_directory():
+    """Return the expanded artwork.directory (or None if it is not set)
+    after making sure it exists.
+    
+    The directory is only created (or found to exist) once; later 
+    calls skip the file system until artwork.directory changes. Raises 
+    DiskError if the directory could not be created.
+    """
+    global _created_directory
+    dirname = _expanded_directory()
+    if dirname and dirname != _created_directory:
+        try:
+            os.makedirs(dirname)
+            logger.debug("created directory {}".format(dirname))
+        except FileExistsError:
+            pass
+        except OSError as e:
+            message = "cannot create directory: {}".format(e.strerror)
+            logger.error(message)
+            raise DiskError(message)
+        _created_directory = dirname
+    return dirname
 
 
 def _file_candidates(artist, album, year=None):
@@ -291,20 +391,19 @@ def _file_candidates(artist, album, year=None):
     Keyword arguments:
     year -- the release year of the album (default None)
     """
-    global directory
     filename = _create_filename(artist, album, year=year)
-    candidates = [os.path.join('{}.{}'.format(filename, ext)) 
-                  for ext in _candidate_exts]
-    if directory:
-        directory = os.path.expanduser(directory)
-        candidates = [os.path.join(directory, fn) for fn in candidates]
-    return candidates
+    dirname = _expanded_directory() or ''
+    return [os.path.join(dirname, '{}.{}'.format(filename, ext))
+            for ext in _candidate_exts]
 
 
 def _file_in_cache(artist, album, year=None):
     """Return the file path to a cached image if it exists, otherwise 
     return None.
     
+    If several candidates exist, the one whose extension comes first 
+    in _candidate_exts is returned.
+    
     Arguments:
     artist -- the artist
     album -- the album
@@ -321,9 +420,64 @@ def _file_in_cache(artist, album, year=None):
     return None
 
 
+def _cache_path(key):
+    """Return the path of the file caching the API response for key."""
+    filename = '{}.json'.format(hashlib.sha1(repr(key).encode()).hexdigest())
+    return os.path.join(_expanded_directory() or '', _api_cache_dirname, 
+                        filename)
+
+
+def _cache_get(key):
+    """Return the cached API response for key, or None if it is not 
+    cached or older than _api_cache_ttl seconds.
+    
+    Arguments:
+    key -- a tuple identifying the request
+    """
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > _api_cache_ttl:
+            return None
+        with open(path) as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return None
+    logger.debug("using cached response for {}".format(key))
+    return value
+
+
+def _cache_put(key, value):
+    """Save an API response for key in the cache.
+    
+    The cache is only an optimization, so errors are logged and 
+    otherwise ignored.
+    
+    Arguments:
+    key -- a tuple identifying the request
+    value -- the response, anything json can serialize
+    """
+    path = _cache_path(key)
+    temp = '{}.{}'.format(path, threading.get_ident())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp, 'w') as f:
+            json.dump(value, f)
+        os.replace(temp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("caching response for {} failed: {}"
+                     "".format(key, getattr(e, 'strerror', None) or e))
+    finally:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
 def _fetch_discogs_releases(artist, album, year=None, master=True):
     """Return a list of URLs to a Discogs release.
     
+    Search results are cached on disk for _api_cache_ttl seconds.
+    
     Raises ReleaseNotFoundError if no releases are found.
     
     Arguments:
@@ -335,18 +489,21 @@ def _fetch_discogs_releases(artist, album, year=None, master=True):
     master -- search Discogs for type 'master' rather than type 
         'release' (default True)
     """
-    args = {
-        'type': 'master' if master else 'release',
-        'artist': artist, 
-        'release_title': album,
-    }
-    if year: args['year'] = year 
-    url = (_discogs_api_url, _discogs_api_search, '?', 
-           urllib.parse.urlencode(args))
-    response = _openurl(''.join(url), _discogs_api_headers)
-    result = json.loads(str(response.read(), 'utf-8'))
-    response.close()
-    releases = [x['resource_url'] for x in result['results']]
+    key = ('releases', artist, album, year, master)
+    releases = _cache_get(key)
+    if releases is None:
+        args = {
+            'type': 'master' if master else 'release',
+            'artist': artist, 
+            'release_title': album,
+        }
+        if year: args['year'] = year 
+        url = _discogs_api_search_prefix + urllib.parse.urlencode(args)
+        response = _openurl(url, _discogs_api_headers)
+        result = _read_json(response)
+        releases = [x['resource_url'] for x in result['results']]
+        if releases:
+            _cache_put(key, releases)
     if not releases:
         message = ("no results for {album} by {artist}"
                    "".format(artist=artist, album=album))
@@ -364,88 +521,405 @@ def _fetch_discogs_image_resources(release):
     type 'primary' are found, return these. If no primary images are 
     found, return the images of type 'secondary'. 
     
+    The images found are cached on disk for _api_cache_ttl seconds.
+    
     Raises ImageNotFoundError if no images are found.
     
     Arguments:
     release -- a URL to a Discogs release
     """
+    key = ('images', release)
+    cached = _cache_get(key)
+    if cached is not None:
+        return [_Image(*image) for image in cached]
     response = _openurl(release, headers=_discogs_api_headers)
-    release_ = json.loads(str(response.read(), 'utf-8'))
-    response.close()
-    resources, secondaries = list(), list()
-    try:
-        images = release_['images']
-        for image in images:
-            if image['type'] == 'primary':
-                resources.append(
-                    _Image(url=image['resource_url'], height=image['height'],
-                           width=image['width'])
-                )
-            else:
-                secondaries.append(
-                    _Image(url=image['resource_url'], height=image['height'],
-                           width=image['width'])
-                )
+    release_ = _read_json(response)
+    images = release_.get('images', ())
+    resources = [_Image(url=image['resource_url'], height=image['height'],
+                        width=image['width'],
+                        area=image['height'] * image['width'])
+                 for image in images if image['type'] == 'primary']
+    if images:
         logger.debug(
             "{np} primary images found in release {release} and {ns} "
-            "secondary images".format(np=len(resources), ns=len(secondaries),
+            "secondary images".format(np=len(resources), 
+                                      ns=len(images) - len(resources),
                                       release=release.split('/')[-1])
         )
-    except KeyError:
-        pass
-    if not resources and secondaries:
-        resources = secondaries
+    if not resources:
+        ### Only build the secondary images if there is no primary one.
+        resources = [_Image(url=image['resource_url'], 
+                            height=image['height'], width=image['width'],
+                            area=image['height'] * image['width'])
+                     for image in images if image['type'] != 'primary']
     if not resources:
         message = ("no images found in release {release}"
                    "".format(release=release.split('/')[-1]))
         logger.error(message)
         raise ImageNotFoundError(message)
+    _cache_put(key, resources)
     return resources
 
 
 def _save_image_to_disk(resource, target):
     """Save an image to disk.
     
-    If the directory in path doesn't exist, try to create it. Raises  
-    DiskError if the directory creation fails or the image could not be
-    saved to disk.
+    If artwork.directory is set and doesn't exist, try to create it. 
+    Raises DiskError if the directory creation fails or the image could 
+    not be saved to disk.
     
     Arguments:
     resource -- the URL to the image
     target -- the target path (filename with extension)
     """
-    global directory
-    target = os.path.expanduser(target)
-    dirname = os.path.dirname(target)
-    if directory and not os.path.isdir(dirname):
-        try:
-            os.makedirs(dirname)
-            logger.debug("created directory {}".format(dirname))
-        except OSError as e:
-            message = "cannot create directory: {}".format(e.strerror)
-            logger.error(message)
-            raise DiskError(message)
+    _ensured_directory()
     ### Prevent 401 Unauthorized when not using OAuth.
     resource = resource.replace('api.discogs.com', 's.pixogs.com')
     ###
     image = _openurl(resource, headers=_discogs_api_headers)
+    _write_image(image, resource, target)
+    return target
+
+
+def _write_image(response, resource, target):
+    """Write the body of an image response to target and record its 
+    validators in a sidecar file (see _meta_path).
+    
+    The body and sidecar are written to temporary files next to target,
+    which only replace the cached files once the complete body has been
+    received. A body shorter than its Content-Length is treated as an 
+    error. On errors the connection is closed rather than reused.
+    
+    Raises ResourceError if reading the response fails and DiskError if
+    the image or its sidecar could not be saved.
+    
+    Arguments:
+    response -- the http.client.HTTPResponse of the image
+    resource -- the URL the image was downloaded from
+    target -- the target path (filename with extension)
+    """
+    meta = {
+        'url': resource,
+        'etag': response.getheader('ETag'),
+        'last_modified': response.getheader('Last-Modified'),
+    }
+    expected, received = response.length, 0
+    temp = '{}.{}'.format(target, threading.get_ident())
+    meta_temp = '{}.{}'.format(_meta_path(target), threading.get_ident())
     try:
-        with open(target, 'wb') as f:
-            f.write(image.read())
+        with open(temp, 'wb') as f:
+            while True:
+                try:
+                    chunk = response.read(_chunk_size)
+                except (http.client.HTTPException, OSError) as e:
+                    error = "downloading artwork failed: {}".format(
+                        _error_message(e))
+                    logger.error(error)
+                    raise ResourceError(error)
+                if not chunk:
+                    break
+                f.write(chunk)
+                received += len(chunk)
+        if expected is not None and received != expected:
+            error = ("downloading artwork failed: received {} of {} bytes"
+                     "".format(received, expected))
+            logger.error(error)
+            raise ResourceError(error)
+        _release_connection(response)
+        with open(meta_temp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temp, target)
+        os.replace(meta_temp, _meta_path(target))
         logger.debug("artwork saved as {}".format(target))
     except OSError as e:
+        _close_connection(response)
         message = "saving artwork failed: {}".format(e.strerror)
         logger.error(message)
         raise DiskError(message)
-    return target
+    except ResourceError:
+        _close_connection(response)
+        raise
+    finally:
+        response.close()
+        for path in (temp, meta_temp):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _meta_path(path):
+    """Return the path of the sidecar file holding the URL, ETag and 
+    Last-Modified header of the image at path.
+    """
+    return '{}.{}'.format(path, _meta_ext)
+
+
+def _file_in_cache_validated(path):
+    """Return path after making sure the cached image is up to date.
+    
+    Send a conditional GET for the URL the image was downloaded from, 
+    using the validators in its sidecar file. If the server answers 
+    304 Not Modified, nothing is downloaded. Otherwise the new image 
+    replaces the cached one once it has been downloaded completely. If
+    the image has no sidecar file or no validators (ETag or 
+    Last-Modified), no request is sent. If the request or download 
+    fails, the cached image is returned as is.
+    
+    Raises DiskError if a new image could not be saved to disk.
+    
+    Arguments:
+    path -- the path to a cached image
+    """
+    try:
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return path
+    if not (meta.get('etag') or meta.get('last_modified')):
+        ### Without validators the server can't answer 304, so the 
+        ### request would always download the whole image again.
+        return path
+    headers = dict(_discogs_api_headers)
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    try:
+        response = _openurl(meta['url'], headers=headers)
+    except ResourceError:
+        return path
+    if response.status == 304:
+        response.read()
+        _release_connection(response)
+        logger.debug("artwork {} is up to date".format(path))
+        return path
+    try:
+        _write_image(response, meta['url'], path)
+    except ResourceError:
+        pass
+    return path
+
+
+class _TokenBucket(object):
+    """Client-side rate limiter shared by all threads.
+    
+    Holds at most capacity tokens which are refilled at rate tokens 
+    per second. Each request takes a token; if none is available, the 
+    caller sleeps until one is.
+    """
+    __slots__ = ('capacity', 'rate', 'tokens', 'last', '_lock')
+    
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, n=1):
+        """Take n tokens, sleeping first if not enough are available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            delay = max(0, (n - self.tokens) / self.rate)
+            ### Reserve the tokens now so other threads queue behind us.
+            self.tokens -= n
+        if delay:
+            logger.debug("rate limit reached, waiting {:.3g} seconds"
+                         "".format(delay))
+            time.sleep(delay)
+
+
+_api_host = urllib.parse.urlparse(_discogs_api_url).netloc
+_api_bucket = _TokenBucket(capacity=2, rate=1.0)
+_image_bucket = _TokenBucket(capacity=5, rate=1000 / 86400)
+
+_timeout = 30
+_max_redirects = 5
+_redirect_codes = (301, 302, 303, 307, 308)
+_max_idle_connections = 4
+_idle_connections = dict()
+_idle_lock = threading.Lock()
+
+
+def _proxy(scheme, netloc):
+    """Return (proxy, headers) for a request to netloc, or None if no 
+    proxy should be used.
+    
+    Proxies are taken from the environment (eg. http_proxy and 
+    https_proxy) like urllib.request.urlopen does. proxy is the URL of 
+    the proxy split by urllib.parse.urlsplit; headers holds the 
+    Proxy-Authorization header if the proxy URL contains credentials.
+    
+    Arguments:
+    scheme -- 'http' or 'https'
+    netloc -- the host (and optional port) to connect to
+    """
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(netloc.split(':')[0]):
+        return None
+    if '://' not in proxy:
+        proxy = 'http://' + proxy
+    proxy = urllib.parse.urlsplit(proxy)
+    headers = dict()
+    if proxy.username:
+        credentials = '{}:{}'.format(
+            urllib.parse.unquote(proxy.username), 
+            urllib.parse.unquote(proxy.password or ''))
+        headers['Proxy-Authorization'] = 'Basic {}'.format(
+            base64.b64encode(credentials.encode()).decode('ascii'))
+    return proxy, headers
+
+
+def _connection(scheme, netloc):
+    """Return (connection, proxy_headers), a persistent connection to 
+    netloc taken from the pool shared by all threads.
+    
+    Connections are kept open between requests (HTTP keep-alive) so 
+    only the first request to a host pays for the TCP and TLS setup. 
+    A new connection is opened if none to netloc is idle. The caller 
+    owns the connection until its response is passed to 
+    _release_connection or _close_connection.
+    
+    If a proxy is configured (see _proxy), HTTPS connections are 
+    tunneled through it. Plain HTTP requests are sent to the proxy 
+    itself; for those, proxy_headers is a dict of headers to add to 
+    the request, which must then use the absolute URL. Otherwise 
+    proxy_headers is None.
+    
+    Arguments:
+    scheme -- 'http' or 'https'
+    netloc -- the host (and optional port) to connect to
+    """
+    with _idle_lock:
+        idle = _idle_connections.get((scheme, netloc))
+        if idle:
+            return idle.pop()
+    proxy = _proxy(scheme, netloc)
+    host = proxy[0].netloc.rpartition('@')[2] if proxy else netloc
+    if scheme == 'https' or (proxy and proxy[0].scheme == 'https'):
+        connection = http.client.HTTPSConnection(host, timeout=_timeout)
+    else:
+        connection = http.client.HTTPConnection(host, timeout=_timeout)
+    proxy_headers = None
+    if proxy and scheme == 'https':
+        connection.set_tunnel(netloc, headers=proxy[1])
+    elif proxy:
+        proxy_headers = proxy[1]
+    return connection, proxy_headers
+
+
+def _release_connection(response):
+    """Give the connection response was received on back to the pool.
+    
+    Call this once the body has been read completely. If it hasn't, or
+    the pool already holds _max_idle_connections for the host, the 
+    connection is closed instead. Once a response has been released or
+    closed, later calls for it do nothing.
+    
+    Arguments:
+    response -- a http.client.HTTPResponse returned by _request
+    """
+    if response.pool is None:
+        return
+    (key, entry), response.pool = response.pool, None
+    if response.isclosed():
+        with _idle_lock:
+            idle = _idle_connections.setdefault(key, list())
+            if len(idle) < _max_idle_connections:
+                idle.append(entry)
+                return
+    entry[0].close()
+
+
+def _close_connection(response):
+    """Close the connection response was received on instead of giving
+    it back to the pool, so an unread or broken body is never mistaken 
+    for the next response.
+    
+    Arguments:
+    response -- a http.client.HTTPResponse returned by _request
+    """
+    if response.pool is not None:
+        response.pool[1][0].close()
+        response.pool = None
+
+
+def _close_idle_connections():
+    """Close all connections in the pool."""
+    with _idle_lock:
+        for idle in _idle_connections.values():
+            for connection, _ in idle:
+                connection.close()
+        _idle_connections.clear()
+
+atexit.register(_close_idle_connections)
+
+
+def _request(url, headers):
+    """Send a GET request for url on a pooled connection and return the
+    http.client.HTTPResponse, following redirects.
+    
+    Raises http.client.HTTPException or OSError on errors.
+    
+    Arguments:
+    url -- the URL to open
+    headers -- the headers for the HTTP request as a dict
+    """
+    for _ in range(_max_redirects + 1):
+        parts = urllib.parse.urlsplit(url)
+        path = urllib.parse.urlunsplit(('', '', parts.path or '/', 
+                                        parts.query, ''))
+        key = (parts.scheme, parts.netloc)
+        connection, proxy_headers = entry = _connection(*key)
+        request_headers = headers
+        if proxy_headers is not None:
+            path = urllib.parse.urlunsplit(parts._replace(fragment=''))
+            request_headers = dict(headers, **proxy_headers)
+        try:
+            try:
+                connection.request('GET', path, headers=request_headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                ### The server dropped an idle connection, reconnect once.
+                connection.close()
+                connection.request('GET', path, headers=request_headers)
+                response = connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            raise
+        response.url, response.pool = url, (key, entry)
+        if response.status not in _redirect_codes:
+            return response
+        try:
+            response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            raise
+        _release_connection(response)
+        location = response.getheader('Location')
+        if not location:
+            raise http.client.HTTPException(
+                "HTTP {} without Location header".format(response.status))
+        url = urllib.parse.urljoin(url, location)
+    raise http.client.HTTPException("too many redirects")
 
 
 def _openurl(url, headers={}):
     """Open a URL (HTTP GET) and return its response.
     
-    For HTTP URLs this function returns a http.client.HTTPResponse 
-    object. For file URLs (eg. an image) this function returns the 
-    bytes.
+    Return a http.client.HTTPResponse object. Its connection comes from
+    a shared pool: pass the response to _release_connection once the 
+    body has been read completely (as _read_json does), or to 
+    _close_connection if reading it failed.
+    
+    Requests to the Discogs API and to the image host are throttled 
+    client-side by _api_bucket and _image_bucket respectively. A 
+    request takes one token, however many redirects it follows.
     
     Raises ResourceError on errors.
     
@@ -455,35 +929,68 @@ def _openurl(url, headers={}):
     Keyword arguments:
     headers -- the headers for the HTTP request as a dict (default {})
     """
+    if urllib.parse.urlsplit(url).netloc == _api_host:
+        _api_bucket.acquire()
+    else:
+        _image_bucket.acquire()
+    time_begin = time.time()
     try:
-        time_begin = time.time()
-        request = urllib.request.Request(url, headers=headers)
-        response = urllib.request.urlopen(request)
-        time_end = time.time()
-        logger.debug("opening {} took {:.3g} seconds"
-                     "".format(url, time_end - time_begin))
-    except urllib.error.HTTPError as e:
+        response = _request(url, headers)
+    except (http.client.HTTPException, OSError) as e:
         time_end = time.time()
         logger.debug("opening {} failed, took {:.3g} seconds"
                      "".format(url, time_end - time_begin))
-        error = "HTTP {} {}".format(e.code, e.reason)
+        error = _error_message(e)
         logger.error(error)
         raise ResourceError(error)
-    except urllib.error.URLError as e:
-        time_end = time.time()
-        logger.debug("opening {} failed, took {:.3g} seconds"
-                     "".format(url, time_end - time_begin))
-        logger.error(e.reason)
-        raise ResourceError(e.reason)
-    except OSError as e:
-        time_end = time.time()
+    time_end = time.time()
+    if response.status >= 400:
+        ### Don't read the error body, just drop the connection.
+        _close_connection(response)
+        response.close()
         logger.debug("opening {} failed, took {:.3g} seconds"
                      "".format(url, time_end - time_begin))
-        logger.error(e.strerror)
-        raise ResourceError(e.strerror)
+        error = "HTTP {} {}".format(response.status, response.reason)
+        logger.error(error)
+        raise ResourceError(error)
+    logger.debug("opening {} took {:.3g} seconds"
+                 "".format(url, time_end - time_begin))
     return response
 
 
+def _read_json(response):
+    """Read the body of an API response and return it parsed as JSON.
+    
+    Raises ResourceError if reading the response fails or the body is 
+    not valid JSON. On read errors the connection is closed rather than
+    reused.
+    
+    Arguments:
+    response -- a http.client.HTTPResponse returned by _openurl
+    """
+    try:
+        body = response.read()
+    except (http.client.HTTPException, OSError) as e:
+        _close_connection(response)
+        response.close()
+        error = "reading {} failed: {}".format(response.url, 
+                                              _error_message(e))
+        logger.error(error)
+        raise ResourceError(error)
+    _release_connection(response)
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        error = "invalid JSON from {}: {}".format(response.url, e)
+        logger.error(error)
+        raise ResourceError(error)
+
+
+def _error_message(e):
+    """Return a readable message for an OSError or HTTPException."""
+    return getattr(e, 'strerror', None) or str(e) or type(e).__name__
+
+
 from threading import Thread
 
 class ArtworkWorker(Thread):
@@ -505,41 +1012,56 @@ class ArtworkWorker(Thread):
         
         self.name = 'Artwork'
         self.listeners = list()
+        self._lock = threading.Lock()
         
         self.retrieve_function = get_random
         self.max_retries = 5
+        self.retry_delay = 0.5
+        self.max_retry_delay = 8.0
         self._try = 0
         
     def add_listener(self, listener):
-        self.listeners.append(listener)
+        with self._lock:
+            self.listeners.append(listener)
         
     def remove_listener(self, listener):
-        self.listeners.remove(listener)
+        with self._lock:
+            self.listeners.remove(listener)
     
     def run(self):
         self._get_artwork()
     
     def _get_artwork(self):
-        try:
-            filename = get_cache(self.artist, self.album, year=self.year, 
-                                 alt=self.retrieve_function)
-        except ImageNotFoundError as e:
-            if (self.retrieve_function == get_random and 
-                self._try <= self.max_retries):
+        delay = self.retry_delay
+        while self._try <= self.max_retries:
+            if self._try:
+                ### Back off before retrying so we don't hammer the API.
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+            try:
+                filename = get_cache(self.artist, self.album, year=self.year, 
+                                     alt=self.retrieve_function)
+            except ImageNotFoundError:
+                ### Another random release might have an image.
+                if self.retrieve_function is not get_random:
+                    break
                 self._try += 1
-                self._get_artwork()
+            except ArtworkError:
+                break
             else:
-                self.notify_failure()
-        except ArtworkError as e:
-            self.notify_failure()
-        else:
-            self.notify_success(filename)
+                return self.notify_success(filename)
+        self.notify_failure()
     
     def notify_failure(self):
-        for listener in self.listeners:
+        for listener in self._snapshot_listeners():
             listener.artwork_not_found()
     
     def notify_success(self, filename):
-        for listener in self.listeners:
+        for listener in self._snapshot_listeners():
             listener.artwork_found(filename)
+    
+    def _snapshot_listeners(self):
+        ### Listeners may (un)register during a callback, so notify a copy.
+        with self._lock:
+            return tuple(self.listeners)
 
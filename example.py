@@ -28,8 +28,4 @@ if __name__ == '__main__':
     set_up_logging()
 
     ### Download the artwork.
-    for artist, album, year in albums:
-        try:
-            artwork.get_cache(artist, album, year=year, alt=artwork.get_random)
-        except artwork.ArtworkError:
-            pass
+    artwork.get_many(albums, alt=artwork.get_random)